@@ -7,20 +7,27 @@ Input:
   data/raw/netflix_titles.csv
 
 Outputs (written to data/processed):
-  - netflix_clean.csv                (one row per title)
-  - netflix_genres_exploded.csv      (one row per title-genre)
+  - netflix_clean.parquet            (one row per title)
+  - netflix_genres_exploded.parquet  (one row per title-genre)
   - data_profile.json                (summary stats)
   - logs/parse_errors.csv            (rows with problematic fields if any)
 
 Usage:
   python src/data_prep/clean.py \
       --input data/raw/netflix_titles.csv \
-      --out_dir data/processed
+      --out_dir data/processed \
+      [--output_format {csv,parquet,feather}]
 
 Notes:
-- We explode genres into a separate CSV to keep Tableau responsive.
+- We explode genres into a separate table to keep Tableau responsive.
+- Outputs default to Parquet; pass `--output_format csv` for Tableau setups
+  that need a text connection.
 - We keep country as raw string and also write `primary_country` = first entry.
 - We coerce problematic date/duration to NaN and log them. This keeps rows intact.
+- The parsed raw CSV is cached next to it as netflix_titles.feather (Arrow IPC)
+  and reused while it is newer than the CSV; pass --no_cache to skip it.
+- The input is processed in chunks of CHUNK_SIZE rows, so memory stays bounded
+  for large exports; the profile is accumulated across chunks.
 """
 
 import argparse
@@ -28,34 +35,135 @@ import json
 import logging
 import os
 import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
 
+# Unicode whitespace that Python's \s matches but Arrow's RE2 \s does not (e.g. NBSP).
+# Written as literal characters so the class works with both regex engines.
+_WS_PATTERN = "[\\s\x0b\x1c-\x1f\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+"
+
+# compiled once for the scalar helpers and the column-name normalization
+_WS_RE = re.compile(r"\s+")
+# ASCII digits only, matching the byte scanner and parse_duration_series
+_DIGITS_RE = re.compile(r"(\d+)", re.ASCII)
+_SLUG_PATTERN = "[^a-z0-9]+"
+
+
 # Helper parsing functions
 
+def _as_string(s):
+    """Return `s` with a pandas string dtype, leaving Arrow-backed columns as-is (no copy)."""
+    if isinstance(s.dtype, (pd.StringDtype, pd.ArrowDtype)):
+        return s
+    return s.astype("string")
+
+
 def parse_date_added(s):
     """
     Parse date_added into pandas Timestamp.
-    Accepts formats like 'September 9, 2019' and ISO-like strings.
+    Accepts formats like 'September 9, 2019' and ISO-like strings
+    (UTC offsets are converted to naive UTC).
     Returns pd.NaT on failure.
     """
-    if pd.isna(s):
-        return pd.NaT
-    s = str(s).strip()
+    return parse_date_added_series(pd.Series([s], dtype=object)).iloc[0]
+
+
+_DATETIME_UNITS = ["ns", "us", "ms", "s"]
+
+
+def parse_date_added_series(s):
+    """
+    Vectorized counterpart of `parse_date_added` for a whole Series.
+    Tries the dataset's usual 'September 9, 2019' format first and only
+    falls back to pandas' mixed-format parser for the residual rows.
+    """
+    text = _as_string(s).str.strip()
     # sometimes the date is empty or 'null'
-    if s.lower() in {"", "nan", "none", "null"}:
-        return pd.NaT
-    # try pandas parsing first (handles most human-readable formats)
-    try:
-        return pd.to_datetime(s, errors="coerce")
-    except Exception:
-        return pd.NaT
+    text = text.mask(text.str.lower().isin(["", "nan", "none", "null"]))
+    parsed = pd.to_datetime(text, format="%B %d, %Y", errors="coerce")
+    residual = parsed.isna() & text.notna()
+    if residual.any():
+        # offsets are converted to naive UTC so both passes share one dtype
+        fallback = pd.to_datetime(text[residual], format="mixed", errors="coerce", utc=True).dt.tz_localize(None)
+        # combine at the finer of the two units so fractional seconds survive
+        unit = min(parsed.dt.unit, fallback.dt.unit, key=_DATETIME_UNITS.index)
+        parsed = parsed.dt.as_unit(unit).fillna(fallback.dt.as_unit(unit))
+    return parsed
+
+
+_MIN_BYTES = np.frombuffer(b"min", dtype=np.uint8)
+_SEASON_BYTES = np.frombuffer(b"season", dtype=np.uint8)
+_UNIT_TYPES = {0: None, 1: "min", 2: "seasons"}
+
+
+def _contains_ci(buf, pat):
+    """ASCII case-insensitive substring test on uint8 arrays (`pat` is lowercase)."""
+    for i in range(buf.shape[0] - pat.shape[0] + 1):
+        found = True
+        for j in range(pat.shape[0]):
+            b = buf[i + j]
+            if 65 <= b <= 90:
+                b += 32
+            if b != pat[j]:
+                found = False
+                break
+        if found:
+            return True
+    return False
+
+
+def _scan_duration(buf):
+    """
+    Single pass over the UTF-8 bytes of a duration string.
+    Returns (start, end) of the first digit run ((-1, -1) if none) and a unit
+    code: 1 if it contains 'min', 2 if it contains 'season', else 0.
+    """
+    start = -1
+    end = -1
+    for i in range(buf.shape[0]):
+        if 48 <= buf[i] <= 57:
+            if start < 0:
+                start = i
+            end = i + 1
+        elif start >= 0:
+            break
+    unit = 0
+    if _contains_ci(buf, _MIN_BYTES):
+        unit = 1
+    elif _contains_ci(buf, _SEASON_BYTES):
+        unit = 2
+    return start, end, unit
+
+
+# numba-compiled _scan_duration: None until first needed, False when numba is not installed
+_compiled_scan_duration = None
+
+
+def _duration_scanner():
+    """Import numba and compile the scanner on first use, so the batch pipeline never pays for it."""
+    global _compiled_scan_duration, _contains_ci
+    if _compiled_scan_duration is None:
+        try:
+            from numba import njit
+        except ImportError:  # numba is optional; parse_duration falls back to the regex path
+            _compiled_scan_duration = False
+        else:
+            # the helper must be compiled before the scanner that calls it
+            _contains_ci = njit(cache=True)(_contains_ci)
+            _compiled_scan_duration = njit(cache=True)(_scan_duration)
+    return _compiled_scan_duration
 
 
 def parse_duration(s):
@@ -65,6 +173,7 @@ def parse_duration(s):
       '1 Season' -> (1, 'seasons')
       '3 Seasons' -> (3, 'seasons')
     Returns (None, None) on failure.
+    Uses the numba-compiled byte scanner when numba is installed.
 
     Honest note: we'll coerce unrealistic minute values (>600) to NaN,
     because some scraped data has bad entries. Adjust threshold if you disagree.
@@ -75,23 +184,32 @@ def parse_duration(s):
     if s == "":
         return (np.nan, None)
 
-    # numeric part
-    m = re.search(r"(\d+)", s)
-    if not m:
-        return (np.nan, None)
-    num = int(m.group(1))
-
-    # determine type
-    s_lower = s.lower()
-    if "min" in s_lower:
-        duration_type = "min"
-        # sanity check
+    scan = _duration_scanner()
+    if scan:
+        raw = s.encode("utf-8")
+        start, end, unit = scan(np.frombuffer(raw, dtype=np.uint8))
+        if start < 0:
+            return (np.nan, None)
+        num = int(raw[start:end])
+        duration_type = _UNIT_TYPES[unit]
+    else:
+        # numeric part
+        m = _DIGITS_RE.search(s)
+        if not m:
+            return (np.nan, None)
+        num = int(m.group(1))
+
+        # determine type
+        s_lower = s.lower()
+        duration_type = "min" if "min" in s_lower else "seasons" if "season" in s_lower else None
+
+    # sanity check
+    if duration_type == "min":
         if num <= 0 or num > 600:
             # log potential anomaly to be captured by validator
             return (np.nan, "min")
         return (num, duration_type)
-    elif "season" in s_lower:
-        duration_type = "seasons"
+    elif duration_type == "seasons":
         if num <= 0 or num > 100:
             return (np.nan, "seasons")
         return (num, duration_type)
@@ -100,15 +218,50 @@ def parse_duration(s):
         return (num, None)
 
 
+def parse_duration_series(s):
+    """
+    Vectorized counterpart of `parse_duration` for a whole Series.
+    Returns (duration_num, duration_type) as two Series aligned with `s`,
+    applying the same unit detection and sanity thresholds.
+    """
+    text = _as_string(s)
+    num = pd.to_numeric(text.str.extract(r"(?P<num>\d+)", expand=False), errors="coerce").astype("float64")
+    s_lower = text.str.lower()
+    is_min = s_lower.str.contains("min", regex=False).fillna(False).astype(bool)
+    is_season = ~is_min & s_lower.str.contains("season", regex=False).fillna(False).astype(bool)
+    # no digits -> no type either, same as the scalar path
+    is_min &= num.notna()
+    is_season &= num.notna()
+
+    duration_type = pd.Series(np.where(is_min, "min", np.where(is_season, "seasons", None)), index=s.index, dtype=object)
+    # sanity check
+    bad_min = is_min & ((num <= 0) | (num > 600))
+    bad_season = is_season & ((num <= 0) | (num > 100))
+    num = num.mask(bad_min | bad_season)
+    return num, duration_type
+
+
 def normalize_text_field(s):
     """Trim whitespace and collapse multiple spaces. Return NaN if empty."""
     if pd.isna(s):
         return np.nan
     t = str(s).strip()
-    t = re.sub(r"\s+", " ", t)
+    t = _WS_RE.sub(" ", t)
     return t if t != "" else np.nan
 
 
+def normalize_text_series(s):
+    """
+    Vectorized `normalize_text_field`: trim, collapse whitespace, empty -> NA.
+    Runs as pyarrow.compute kernels (which release the GIL) and returns an
+    Arrow-backed string Series.
+    """
+    arr = pa.array(_as_string(s), type=pa.string())
+    t = pc.replace_substring_regex(pc.utf8_trim_whitespace(arr), _WS_PATTERN, " ")
+    t = pc.if_else(pc.equal(t, ""), pa.scalar(None, pa.string()), t)
+    return pd.Series(pd.arrays.ArrowExtensionArray(t), index=s.index, name=s.name)
+
+
 def extract_primary_country(country_field):
     """
     From 'United States, India' -> 'United States'
@@ -120,62 +273,216 @@ def extract_primary_country(country_field):
     return parts[0] if parts else np.nan
 
 
+def extract_primary_country_series(s):
+    """
+    Vectorized `extract_primary_country`. Leading separators are dropped first
+    so ', South Korea' still yields 'South Korea'.
+    """
+    # drop everything from the first comma on, rather than building a list per row
+    first = _as_string(s).str.lstrip(", ").str.replace(r",.*", "", regex=True).str.strip()
+    return first.mask(first.str.len() == 0)
+
+
+def make_title_slug(titles):
+    """
+    'The Great British Baking Show' -> 'the-great-british-baking-show'
+    Runs as three Arrow kernels over the UTF-8 buffer; NaN titles give ''.
+    """
+    arr = pa.array(_as_string(titles).fillna(""), type=pa.string())
+    slug = pc.utf8_trim(pc.replace_substring_regex(pc.utf8_lower(arr), _SLUG_PATTERN, "-"), "-")
+    return pd.Series(pd.array(slug, dtype="string[pyarrow]"), index=titles.index)
+
+
+# columns of the exploded genre table, in output order
+GENRE_COLS = [
+    "show_id",
+    "title",
+    "type",
+    "genre",
+    "primary_country",
+    "added_year",
+    "release_year",
+    "rating",
+    "duration_num",
+    "duration_type",
+]
+
+
 def explode_genres(df, genres_col="listed_in"):
     """
     Returns a new DataFrame with one row per (show_id, genre).
     Input df must have 'show_id' and the `genres_col` which is comma-separated.
     """
-    df = df.copy()
-    # fillna to avoid errors
-    df[genres_col] = df[genres_col].fillna("")
-    # split into lists
-    df["__genre_list"] = df[genres_col].apply(lambda x: [g.strip() for g in x.split(",") if g.strip()])
+    # some columns may not exist yet; guard
+    existing = [c for c in GENRE_COLS if c in df.columns or c == "genre"]
+    # narrow projection instead of copying the whole frame; the caller's df is not mutated
+    keep = [c for c in existing if c != "genre"]
+    # fillna to avoid errors; split into lists (one vectorized pass; separators absorb surrounding spaces)
+    genre_lists = _as_string(df[genres_col]).fillna("").str.strip().str.split(r"\s*,\s*", regex=True)
     # explode
-    exploded = df.explode("__genre_list")
-    # rename and select columns
-    exploded = exploded.rename(columns={"__genre_list": "genre"})
+    exploded = df[keep].assign(genre=genre_lists).explode("genre")
     exploded = exploded[exploded["genre"].notna() & (exploded["genre"] != "")]
-    # keep relevant columns for genre table
-    cols_to_keep = [
-        "show_id",
-        "title",
-        "type",
-        "genre",
-        "primary_country",
-        "added_year",
-        "release_year",
-        "rating",
-        "duration_num",
-        "duration_type",
-    ]
-    # some columns may not exist yet; guard
-    existing = [c for c in cols_to_keep if c in exploded.columns]
     return exploded[existing].reset_index(drop=True)
 
 
-# Validation & profiling
+def explode_genres_table(tbl, genres_col="genres"):
+    """
+    Arrow counterpart of `explode_genres` for a pyarrow Table.
+    The shared columns are gathered with one `take` on the parent indices of the
+    split genre lists, so no pandas copy of the text-heavy frame is made.
+    """
+    # cast guards the all-null (null-typed) column when the input had no genres
+    genre_lists = pc.split_pattern(tbl.column(genres_col).cast(pa.string()).combine_chunks(), ",")
+    parent_idx = pc.list_parent_indices(genre_lists)
+    genres = pc.utf8_trim_whitespace(pc.list_flatten(genre_lists))
+    # drop empty entries (e.g. trailing commas)
+    keep = pc.fill_null(pc.not_equal(genres, ""), False)
+    parent_idx = parent_idx.filter(keep)
+    genres = genres.filter(keep)
 
-def basic_profile_and_validate(df, out_dir):
+    existing = [c for c in GENRE_COLS if c == "genre" or c in tbl.column_names]
+    pos = existing.index("genre")
+    base = tbl.select([c for c in existing if c != "genre"]).take(parent_idx)
+    return base.add_column(pos, "genre", genres)
+
+
+# Output writers
+
+OUTPUT_FORMATS = ("csv", "parquet", "feather")
+
+
+def _check_output_format(output_format):
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output_format {output_format!r}; expected one of {OUTPUT_FORMATS}")
+
+
+def _format_timestamps(table):
     """
-    Run basic assertions and write a small profile JSON.
-    Returns a dict profile.
+    Render timestamp columns as CSV text in one fixed, lossless format:
+    date and time, with fractional seconds at the column's own unit.
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            table = table.set_column(i, field.name, pc.strftime(table.column(i), format="%Y-%m-%d %H:%M:%S"))
+    return table
+
+
+class TableWriter:
+    """
+    Incrementally write DataFrame chunks to a single csv/parquet/feather file.
+    The Arrow schema is fixed by the first chunk (all-null columns become
+    strings, categoricals get int32 indices) and later chunks are cast to it
+    with a safe cast, so a chunk that cannot be stored losslessly raises.
     """
+
+    def __init__(self, path, output_format):
+        _check_output_format(output_format)
+        self.path = path
+        self.output_format = output_format
+        self.rows = 0
+        self._schema = None
+        self._writer = None
+
+    def write(self, df):
+        """Append a DataFrame or pyarrow Table."""
+        table = df if isinstance(df, pa.Table) else pa.Table.from_pandas(df, preserve_index=False)
+        if self.output_format == "csv":
+            table = _format_timestamps(table)
+        if self._schema is None:
+            self._schema = pa.schema(
+                [f.with_type(self._stable_type(f.type)) for f in table.schema],
+                metadata=table.schema.metadata,
+            )
+            if self.output_format == "parquet":
+                self._writer = pq.ParquetWriter(self.path, self._schema, compression="zstd")
+            elif self.output_format == "feather":
+                options = pa.ipc.IpcWriteOptions(compression="zstd")
+                self._writer = pa.ipc.new_file(self.path, self._schema, options=options)
+            else:
+                # multi-threaded C++ writer; header is written with the first batch
+                options = pacsv.WriteOptions(include_header=True, quoting_style="needed")
+                self._writer = pacsv.CSVWriter(self.path, self._schema, write_options=options)
+        self._writer.write_table(table.cast(self._schema))
+        self.rows += table.num_rows
+
+    def _stable_type(self, arrow_type):
+        """Column type that every later chunk can be cast to."""
+        if pa.types.is_null(arrow_type):
+            return pa.string()
+        if pa.types.is_dictionary(arrow_type):
+            # a categorical with no categories (all-null chunk) has null values
+            value_type = pa.string() if pa.types.is_null(arrow_type.value_type) else arrow_type.value_type
+            # each chunk has its own categories: Parquet re-encodes per row group, but the
+            # Arrow IPC file format cannot replace dictionaries between batches (and CSV is text)
+            if self.output_format in ("feather", "csv"):
+                return value_type
+            return pa.dictionary(pa.int32(), value_type)
+        return arrow_type
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_table(df, path, output_format):
+    """Write `df` to `path` in one of OUTPUT_FORMATS (no index)."""
+    with TableWriter(path, output_format) as writer:
+        writer.write(df)
+
+
+# Validation & profiling
+
+def _new_profile():
+    """Running accumulator for the profile; fed chunk by chunk via `_update_profile`."""
+    return {
+        "raw_rows": 0,
+        "show_ids": set(),
+        "type_counts": Counter(),
+        "null_counts": Counter(),
+        "added_year_min": None,
+        "added_year_max": None,
+    }
+
+
+def _update_profile(acc, df):
+    acc["raw_rows"] += int(len(df))
+    acc["show_ids"].update(df["show_id"].dropna().unique())
+    # missing types are counted under "NaN" (pd.NA keys are not JSON-serializable)
+    type_counts = df["type"].value_counts(dropna=False)
+    acc["type_counts"].update({("NaN" if pd.isna(k) else k): int(n) for k, n in type_counts.items()})
+    # nulls = rows - non-null count; count() avoids materializing an isna() frame
+    acc["null_counts"].update({c: int(n) for c, n in zip(df.columns, len(df) - df.count().to_numpy())})
+    if "added_year" in df.columns and df["added_year"].notna().any():
+        yr_min = int(df["added_year"].min(skipna=True))
+        yr_max = int(df["added_year"].max(skipna=True))
+        acc["added_year_min"] = yr_min if acc["added_year_min"] is None else min(acc["added_year_min"], yr_min)
+        acc["added_year_max"] = yr_max if acc["added_year_max"] is None else max(acc["added_year_max"], yr_max)
+    return acc
+
+
+def _write_profile(acc, out_dir):
+    """Finalize the accumulator, run the sanity checks and write data_profile.json."""
     profile = {}
-    profile["raw_rows"] = int(len(df))
-    profile["unique_show_id"] = int(df["show_id"].nunique())
-    profile["type_counts"] = df["type"].value_counts(dropna=False).to_dict()
-    profile["null_counts"] = df.isna().sum().to_dict()
+    profile["raw_rows"] = acc["raw_rows"]
+    profile["unique_show_id"] = len(acc["show_ids"])
+    profile["type_counts"] = dict(acc["type_counts"].most_common())
+    profile["null_counts"] = dict(acc["null_counts"])
 
     # added_year sanity
     current_year = datetime.now().year
-    if "added_year" in df.columns:
-        yr_min = int(df["added_year"].min(skipna=True)) if df["added_year"].notna().any() else None
-        yr_max = int(df["added_year"].max(skipna=True)) if df["added_year"].notna().any() else None
-        profile["added_year_min"] = yr_min
-        profile["added_year_max"] = yr_max
-        # warn if outside reasonable range
-        if yr_min and (yr_min < 1920 or yr_max > current_year + 1):
-            logging.warning("added_year contains values outside expected range (1920 - next year)")
+    yr_min, yr_max = acc["added_year_min"], acc["added_year_max"]
+    profile["added_year_min"] = yr_min
+    profile["added_year_max"] = yr_max
+    # warn if outside reasonable range
+    if yr_min and (yr_min < 1920 or yr_max > current_year + 1):
+        logging.warning("added_year contains values outside expected range (1920 - next year)")
 
     # write profile
     os.makedirs(out_dir, exist_ok=True)
@@ -186,54 +493,79 @@ def basic_profile_and_validate(df, out_dir):
     return profile
 
 
-# Main cleaning pipeline
-
-def clean_netflix(
-    input_csv,
-    out_dir="data/processed",
-    logs_dir="logs",
-    write_outputs=True,
-    drop_rows=False,
-):
+def basic_profile_and_validate(df, out_dir):
     """
-    Main pipeline:
-      - loads input CSV
-      - normalizes fields
-      - parses date and duration
-      - creates derived columns
-      - writes netflix_clean.csv and netflix_genres_exploded.csv
+    Run basic assertions and write a small profile JSON.
+    Returns a dict profile.
     """
-    os.makedirs(out_dir, exist_ok=True)
-    os.makedirs(logs_dir, exist_ok=True)
+    return _write_profile(_update_profile(_new_profile(), df), out_dir)
 
-    logging.info(f"Loading input CSV: {input_csv}")
-    df = pd.read_csv(input_csv, dtype=str, low_memory=False)
 
-    logging.info(f"Initial rows: {len(df)}")
-    # normalize column names to snake_case
-    df.columns = [re.sub(r"\s+", "_", c.strip()).lower() for c in df.columns]
-
-    # ensure show_id exists
-    if "show_id" not in df.columns:
-        raise ValueError("Input CSV must contain 'show_id' column.")
+# Main cleaning pipeline
 
-    # strip whitespace from string fields (apply to a subset for speed)
-    for col in ["title", "director", "cast", "country", "listed_in", "rating", "description", "duration"]:
-        if col in df.columns:
-            df[col] = df[col].apply(normalize_text_field)
+CHUNK_SIZE = 100_000
+
+# stable column order for netflix_clean; any other columns go at the end
+CLEAN_COLS_ORDER = [
+    "show_id",
+    "title",
+    "title_slug",
+    "type",
+    "director",
+    "cast",
+    "country",
+    "primary_country",
+    "genres",
+    "release_year",
+    "date_added",
+    "added_year",
+    "added_month",
+    "added_quarter",
+    "rating",
+    "duration_num",
+    "duration_type",
+    "description",
+]
+
+
+# free-text columns trimmed and whitespace-collapsed by normalize_text_series
+TEXT_COLS = ["title", "director", "cast", "country", "listed_in", "rating", "description", "duration"]
+
+# repeated-value columns stored as pandas categoricals
+CATEGORY_COLS = ["type", "rating", "duration_type", "primary_country", "added_quarter"]
+
+
+def _clean_chunk(df):
+    """
+    Normalize and derive columns for one chunk of the raw CSV; returns it in output column order.
+    Column names are expected to be snake_case already (see `_read_columns`).
+    """
+    # strip whitespace from string fields (apply to a subset for speed);
+    # the Arrow kernels release the GIL, so columns are normalized in parallel threads
+    text_cols = [c for c in TEXT_COLS if c in df.columns]
+    if text_cols:
+        with ThreadPoolExecutor(max_workers=min(len(text_cols), os.cpu_count() or 1)) as ex:
+            normalized = list(ex.map(normalize_text_series, (df[c] for c in text_cols)))
+        for col, values in zip(text_cols, normalized):
+            df[col] = values
 
     # Parse date_added
     if "date_added" in df.columns:
-        df["date_added_parsed"] = df["date_added"].apply(parse_date_added)
-        df["date_added"] = df["date_added_parsed"]
-        df = df.drop(columns=["date_added_parsed"])
+        df["date_added"] = parse_date_added_series(df["date_added"])
     else:
         df["date_added"] = pd.NaT
 
-    # derive added_year and added_month
-    df["added_year"] = df["date_added"].dt.year
-    df["added_month"] = df["date_added"].dt.month
-    df["added_quarter"] = df["date_added"].dt.to_period("Q").astype(str)
+    # derive added_year and added_month (float64 in every chunk, whether or not it has NaT)
+    df["added_year"] = df["date_added"].dt.year.astype("float64")
+    df["added_month"] = df["date_added"].dt.month.astype("float64")
+    # 'YYYYQn' from the year/month already extracted, without allocating Period objects
+    quarter = (df["added_month"] - 1) // 3 + 1
+    df["added_quarter"] = (
+        df["added_year"].astype("Int64").astype("string") + "Q" + quarter.astype("Int64").astype("string")
+    )
+    # date_added is a calendar date: store it as date32 so every output format
+    # carries a plain date (CSV prints YYYY-MM-DD), independent of chunking
+    df["date_added"] = df["date_added"].astype(pd.ArrowDtype(pa.date32()))
 
     # release_year -> numeric
     if "release_year" in df.columns:
@@ -245,22 +577,16 @@ def clean_netflix(
     df["duration_num"] = np.nan
     df["duration_type"] = pd.NA
     if "duration" in df.columns:
-        parsed = df["duration"].apply(parse_duration)
-        df["duration_num"] = parsed.apply(lambda x: x[0])
-        df["duration_type"] = parsed.apply(lambda x: x[1])
-
-    # normalize rating
-    if "rating" in df.columns:
-        df["rating"] = df["rating"].apply(lambda x: x.strip() if isinstance(x, str) else x)
+        df["duration_num"], df["duration_type"] = parse_duration_series(df["duration"])
 
     # primary_country
     if "country" in df.columns:
-        df["primary_country"] = df["country"].apply(extract_primary_country)
+        df["primary_country"] = extract_primary_country_series(df["country"])
     else:
         df["primary_country"] = pd.NA
 
     # title_slug
-    df["title_slug"] = df["title"].fillna("").str.lower().str.replace(r"[^a-z0-9]+", "-", regex=True).str.strip("-")
+    df["title_slug"] = make_title_slug(df["title"])
 
     # keep original genres column as 'listed_in' (already normalized) and create 'genres' alias
     if "listed_in" in df.columns:
@@ -268,69 +594,205 @@ def clean_netflix(
     else:
         df["genres"] = pd.NA
 
-    # Logging unusual values to parse_errors
-    parse_errors = []
+    # low-cardinality columns: small int codes for value_counts, dictionary-encoded on write
+    for col in CATEGORY_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    cols_existing = [c for c in CLEAN_COLS_ORDER if c in df.columns]
+    remaining = [c for c in df.columns if c not in cols_existing]
+    return df[cols_existing + remaining]
+
+
+def _read_columns(input_csv):
+    """
+    Read only the header row and return snake_case column names, so the full
+    read can apply them via names= instead of renaming every chunk.
+    """
+    header = pd.read_csv(input_csv, nrows=0).columns
+    # normalize column names to snake_case
+    columns = [_WS_RE.sub("_", c.strip()).lower() for c in header]
+
+    # ensure show_id exists
+    if "show_id" not in columns:
+        raise ValueError("Input CSV must contain 'show_id' column.")
+    return columns
+
+
+def _raw_cache_path(input_csv):
+    """Arrow IPC (Feather v2) cache kept next to the raw CSV."""
+    return os.path.splitext(input_csv)[0] + ".feather"
+
+
+def _iter_raw_chunks(input_csv, chunksize, use_cache=True):
+    """
+    Yield the raw input as DataFrames of at most `chunksize` rows with snake_case
+    names and Arrow-backed string columns.
+
+    If a Feather cache newer than the CSV exists, it is memory-mapped and read
+    batch by batch instead of re-parsing the CSV; otherwise the CSV is parsed and, with
+    `use_cache`, each chunk is also appended to a fresh cache file.
+    """
+    columns = _read_columns(input_csv)
+    cache_path = _raw_cache_path(input_csv)
+
+    if use_cache and os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(input_csv):
+        logging.info(f"Reading cached raw data: {cache_path}")
+        with pa.memory_map(cache_path) as source:
+            cache = pa.ipc.open_file(source)
+            # batch by batch (each was one CSV chunk) so only one is decompressed at a time
+            for i in range(cache.num_record_batches):
+                batch = cache.get_batch(i)
+                for offset in range(0, batch.num_rows, chunksize):
+                    yield batch.slice(offset, chunksize).to_pandas(types_mapper=pd.ArrowDtype)
+        return
+
+    schema = pa.schema([(c, pa.string()) for c in columns])
+    tmp_path = cache_path + ".tmp"
+    writer = None
+    if use_cache:
+        try:
+            writer = pa.ipc.new_file(tmp_path, schema, options=pa.ipc.IpcWriteOptions(compression="lz4"))
+        except OSError as e:
+            # e.g. read-only input directory: caching is an optimization, not a requirement
+            logging.warning(f"Not caching raw data ({e}); reading {input_csv} uncached")
+    # read every field as an Arrow-backed string (contiguous UTF-8 buffers, Arrow str kernels)
+    reader = pd.read_csv(
+        input_csv,
+        header=0,
+        names=columns,
+        dtype=pd.ArrowDtype(pa.string()),
+        dtype_backend="pyarrow",
+        chunksize=chunksize,
+    )
+    complete = False
+    try:
+        for chunk in reader:
+            if writer is not None:
+                try:
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                except OSError as e:
+                    logging.warning(f"Not caching raw data ({e}); reading {input_csv} uncached")
+                    _discard_cache(writer, tmp_path)
+                    writer = None
+            yield chunk
+        complete = True
+    finally:
+        reader.close()
+        if writer is not None:
+            # only publish a cache that covers the whole CSV
+            if complete:
+                try:
+                    writer.close()
+                    os.replace(tmp_path, cache_path)
+                except OSError as e:
+                    logging.warning(f"Could not write raw data cache {cache_path} ({e})")
+                    _discard_cache(None, tmp_path)
+            else:
+                _discard_cache(writer, tmp_path)
+
+
+def _discard_cache(writer, tmp_path):
+    """Close and remove a partial cache file, ignoring I/O errors."""
+    try:
+        if writer is not None:
+            writer.close()
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+
+def _collect_parse_errors(df):
+    """Return a (show_id, field, value) frame of unusual values in a cleaned chunk."""
     # duration anomalies
-    dur_anom = df[(df["duration_type"] == "min") & df["duration_num"].notna() & (df["duration_num"] > 600)]
-    if not dur_anom.empty:
-        for idx, row in dur_anom.iterrows():
-            parse_errors.append({"show_id": row["show_id"], "field": "duration_num", "value": row["duration_num"]})
+    m_dur = (df["duration_type"] == "min") & df["duration_num"].notna() & (df["duration_num"] > 600)
+    dur_err = pd.DataFrame({
+        "show_id": df.loc[m_dur, "show_id"],
+        "field": "duration_num",
+        "value": df.loc[m_dur, "duration_num"],
+    })
 
     # date anomalies: added_year outside reasonable range
-    if df["added_year"].notna().any():
-        current_year = datetime.now().year
-        bad_dates = df[(df["added_year"] < 1920) | (df["added_year"] > current_year + 1)]
-        if not bad_dates.empty:
-            for idx, row in bad_dates.iterrows():
-                parse_errors.append({"show_id": row["show_id"], "field": "added_year", "value": int(row["added_year"])})
+    current_year = datetime.now().year
+    m_date = (df["added_year"] < 1920) | (df["added_year"] > current_year + 1)
+    date_err = pd.DataFrame({
+        "show_id": df.loc[m_date, "show_id"],
+        "field": "added_year",
+        "value": df.loc[m_date, "added_year"].astype("Int64"),
+    })
+
+    # values stay object so years are not upcast to float
+    return [e.astype({"value": object}) for e in (dur_err, date_err) if not e.empty]
+
+
+def clean_netflix(
+    input_csv,
+    out_dir="data/processed",
+    logs_dir="logs",
+    write_outputs=True,
+    drop_rows=False,
+    output_format="parquet",
+    chunksize=CHUNK_SIZE,
+    use_cache=True,
+):
+    """
+    Main pipeline:
+      - streams the input CSV in chunks of `chunksize` rows
+      - normalizes fields
+      - parses date and duration
+      - creates derived columns
+      - appends each chunk to netflix_clean and netflix_genres_exploded in `output_format`
+    Peak memory is bounded by the chunk size; the profile is accumulated across chunks.
+    With `use_cache`, the parsed raw CSV is cached as <input>.feather for faster reruns.
+    """
+    _check_output_format(output_format)
+    os.makedirs(out_dir, exist_ok=True)
+    os.makedirs(logs_dir, exist_ok=True)
+
+    clean_path = os.path.join(out_dir, f"netflix_clean.{output_format}")
+    genres_path = os.path.join(out_dir, f"netflix_genres_exploded.{output_format}")
+    clean_writer = genres_writer = None
+    if write_outputs:
+        clean_writer = TableWriter(clean_path, output_format)
+        genres_writer = TableWriter(genres_path, output_format)
+
+    acc = _new_profile()
+    error_frames = []
+
+    logging.info(f"Loading input CSV: {input_csv}")
+    try:
+        for chunk in _iter_raw_chunks(input_csv, chunksize, use_cache=use_cache):
+            df = _clean_chunk(chunk)
+            _update_profile(acc, df)
+            error_frames.extend(_collect_parse_errors(df))
+            if write_outputs:
+                # one Arrow conversion feeds both outputs
+                tbl = pa.Table.from_pandas(df, preserve_index=False)
+                clean_writer.write(tbl)
+                genres_writer.write(explode_genres_table(tbl, genres_col="genres"))
+    finally:
+        if write_outputs:
+            clean_writer.close()
+            genres_writer.close()
+
+    logging.info(f"Initial rows: {acc['raw_rows']}")
+
+    # Logging unusual values to parse_errors
+    parse_errors_df = pd.concat(error_frames, ignore_index=True) if error_frames else None
+    parse_errors = parse_errors_df.to_dict("records") if parse_errors_df is not None else []
 
     # write parse errors if any
     if parse_errors:
-        parse_errors_df = pd.DataFrame(parse_errors)
         err_path = os.path.join(logs_dir, "parse_errors.csv")
         parse_errors_df.to_csv(err_path, index=False)
         logging.warning(f"Wrote parse errors to {err_path}")
 
     # Basic profile
-    profile = basic_profile_and_validate(df, out_dir=out_dir)
+    profile = _write_profile(acc, out_dir=out_dir)
 
-    # Save netflix_clean.csv
-    clean_path = os.path.join(out_dir, "netflix_clean.csv")
     if write_outputs:
-        # select a stable column order if available
-        cols_order = [
-            "show_id",
-            "title",
-            "title_slug",
-            "type",
-            "director",
-            "cast",
-            "country",
-            "primary_country",
-            "genres",
-            "release_year",
-            "date_added",
-            "added_year",
-            "added_month",
-            "added_quarter",
-            "rating",
-            "duration_num",
-            "duration_type",
-            "description",
-        ]
-        cols_existing = [c for c in cols_order if c in df.columns]
-        # include any other columns at the end
-        remaining = [c for c in df.columns if c not in cols_existing]
-        final_cols = cols_existing + remaining
-        df[final_cols].to_csv(clean_path, index=False, encoding="utf-8")
         logging.info(f"Wrote cleaned data to {clean_path}")
-
-    # Create exploded genres CSV
-    genres_df = explode_genres(df, genres_col="genres")
-    genres_path = os.path.join(out_dir, "netflix_genres_exploded.csv")
-    if write_outputs:
-        genres_df.to_csv(genres_path, index=False, encoding="utf-8")
-        logging.info(f"Wrote exploded genres to {genres_path} (rows: {len(genres_df)})")
+        logging.info(f"Wrote exploded genres to {genres_path} (rows: {genres_writer.rows})")
 
     return {
         "clean_path": clean_path,
@@ -345,11 +807,29 @@ def clean_netflix(
 def main():
     parser = argparse.ArgumentParser(description="Clean Netflix titles CSV for Tableau use.")
     parser.add_argument("--input", "-i", required=True, help="Input raw netflix_titles.csv")
-    parser.add_argument("--out_dir", "-o", default="data/processed", help="Output directory for processed CSVs")
+    parser.add_argument("--out_dir", "-o", default="data/processed", help="Output directory for processed files")
     parser.add_argument("--logs_dir", default="logs", help="Directory to write parse error logs")
+    parser.add_argument(
+        "--output_format",
+        choices=OUTPUT_FORMATS,
+        default="parquet",
+        help="File format for processed outputs (csv for Tableau text connections)",
+    )
+    parser.add_argument(
+        "--no_cache",
+        action="store_true",
+        help="Always parse the input CSV; do not read or write the .feather raw-data cache",
+    )
     args = parser.parse_args()
 
-    res = clean_netflix(input_csv=args.input, out_dir=args.out_dir, logs_dir=args.logs_dir, write_outputs=True)
+    res = clean_netflix(
+        input_csv=args.input,
+        out_dir=args.out_dir,
+        logs_dir=args.logs_dir,
+        write_outputs=True,
+        output_format=args.output_format,
+        use_cache=not args.no_cache,
+    )
     logging.info("Cleaning finished.")
     logging.info(json.dumps(res["profile"], indent=2))
 
@@ -1,9 +1,28 @@
+import json
+import logging
 import os
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 import pytest
 
-from ..utils import parse_duration, parse_date_added, explode_genres
+from .. import clean
+from ..utils import (
+    TableWriter,
+    clean_netflix,
+    explode_genres,
+    explode_genres_table,
+    extract_primary_country,
+    extract_primary_country_series,
+    make_title_slug,
+    normalize_text_field,
+    normalize_text_series,
+    parse_date_added,
+    parse_date_added_series,
+    parse_duration,
+    parse_duration_series,
+    write_table,
+)
 
 
 def test_parse_duration_minutes():
@@ -30,6 +49,49 @@ def test_parse_duration_seasons():
     assert num2 == 1
 
 
+READERS = {"csv": pd.read_csv, "parquet": pd.read_parquet, "feather": pd.read_feather}
+
+
+def _run_clean(tmp_path, raw, out="out", **kw):
+    """Write `raw` to tmp_path/raw.csv (once, so a raw cache stays valid) and run clean_netflix on it."""
+    input_csv = tmp_path / "raw.csv"
+    if not input_csv.exists():
+        raw.to_csv(input_csv, index=False)
+    return clean_netflix(str(input_csv), out_dir=str(tmp_path / out), logs_dir=str(tmp_path / "logs"), **kw)
+
+
+def assert_matches_scalar(out, values, scalar_fn):
+    """Each element of `out` equals scalar_fn(value), with any missing value matching any other."""
+    for i, v in enumerate(values):
+        expected = scalar_fn(v)
+        if pd.isna(expected):
+            assert pd.isna(out.iloc[i])
+        else:
+            assert out.iloc[i] == expected
+
+
+def test_parse_duration_series_matches_scalar():
+    values = ["90 min", "1000 min", "1 Season", "3 Seasons", "", None, "abc", "12 episodes"]
+    nums, types = parse_duration_series(pd.Series(values))
+    assert_matches_scalar(nums, values, lambda v: parse_duration(v)[0])
+    assert_matches_scalar(types, values, lambda v: parse_duration(v)[1])
+
+
+def test_parse_duration_numba_and_regex_paths_agree(monkeypatch):
+    pytest.importorskip("numba")
+    values = [
+        "90 min", " 12 MIN", "1000 min", "0 Seasons", "1 Season", "3 Seasons",
+        "abc 7", "Minutes 5", "99999999999999999999999 min", "２ min", "x", "", None,
+    ]
+    compiled = [parse_duration(v) for v in values]
+    assert clean._compiled_scan_duration
+    monkeypatch.setattr(clean, "_compiled_scan_duration", False)
+    for v, (num, dtype) in zip(values, compiled):
+        exp_num, exp_type = parse_duration(v)
+        assert dtype == exp_type
+        assert (np.isnan(num) and np.isnan(exp_num)) if pd.isna(exp_num) else num == exp_num
+
+
 def test_parse_date_added_various():
     d1 = "September 9, 2019"
     parsed1 = parse_date_added(d1)
@@ -44,6 +106,43 @@ def test_parse_date_added_various():
     assert pd.isna(parsed3)
 
 
+def test_parse_date_added_series_mixed_formats():
+    s = pd.Series([
+        "September 9, 2019", " 2018-04-05", "2019-01-01 10:00:00.5", "2019-01-01T00:00:00+05:00",
+        "null", None, "not a date",
+    ])
+    parsed = parse_date_added_series(s)
+    assert parsed.iloc[0].year == 2019
+    assert parsed.iloc[1].year == 2018
+    # fractional seconds kept; offsets converted to naive UTC
+    assert parsed.iloc[2] == pd.Timestamp("2019-01-01 10:00:00.5")
+    assert parsed.iloc[3] == pd.Timestamp("2018-12-31 19:00:00")
+    assert parsed.iloc[4:].isna().all()
+
+    assert parse_date_added("2019-01-01 10:00:00.5") == pd.Timestamp("2019-01-01 10:00:00.5")
+    mixed = parse_date_added_series(pd.Series(["September 9, 2019", "2019-01-01T10:00:00.123Z"]))
+    assert mixed.iloc[1] == pd.Timestamp("2019-01-01 10:00:00.123")
+
+
+def test_normalize_text_series_matches_scalar():
+    values = ["  Legend\xa0of  Exorcism ", "   ", None, "Dramas", "a\x0b\x0bb", "\x0bc\x1c"]
+    out = normalize_text_series(pd.Series(values, dtype=object))
+    assert_matches_scalar(out, values, normalize_text_field)
+
+
+def test_extract_primary_country_series_matches_scalar():
+    values = ["United States, India", ", South Korea", "Poland,", None, " , "]
+    out = extract_primary_country_series(pd.Series(values, dtype=object))
+    assert_matches_scalar(out, values, extract_primary_country)
+
+
+def test_make_title_slug():
+    s = pd.Series(["The Great British Baking Show", "  #Alive!", None], index=[5, 6, 7])
+    slug = make_title_slug(s)
+    assert slug.tolist() == ["the-great-british-baking-show", "alive", ""]
+    assert list(slug.index) == [5, 6, 7]
+
+
 def test_genre_explosion(tmp_path):
     # create a simple df
     df = pd.DataFrame({
@@ -68,3 +167,157 @@ def test_genre_explosion(tmp_path):
     # check required columns present
     for c in ["show_id", "title", "type", "genre", "primary_country", "added_year"]:
         assert c in exploded.columns
+
+    # Arrow path gives the same rows and columns
+    df["listed_in"] = ["Dramas, International Movies,", "Comedies"]
+    tbl = pa.Table.from_pandas(df, preserve_index=False)
+    exploded_tbl = explode_genres_table(tbl, genres_col="listed_in").to_pandas()
+    assert list(exploded_tbl.columns) == list(exploded.columns)
+    assert exploded_tbl["genre"].tolist() == exploded["genre"].tolist()
+    assert exploded_tbl["show_id"].tolist() == ["s1", "s1", "s2"]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "feather"])
+def test_write_table_roundtrip(tmp_path, fmt):
+    df = pd.DataFrame({"show_id": ["s1", "s2"], "duration_num": [90.0, np.nan]})
+    path = tmp_path / f"out.{fmt}"
+    write_table(df, str(path), fmt)
+    back = READERS[fmt](path)
+    assert list(back["show_id"]) == ["s1", "s2"]
+    assert back["duration_num"].isna().tolist() == [False, True]
+
+
+def test_clean_netflix_chunked_matches_single_pass(tmp_path):
+    raw = pd.DataFrame({
+        "show_id": ["s1", "s2", "s3", "s4", "s5"],
+        "type": ["Movie", "TV Show", "Movie", "Movie", "TV Show"],
+        "title": ["A", "B", "C", "D", "E"],
+        "country": ["United States, India", None, ", France", "India", "Japan"],
+        "date_added": ["September 9, 2019", "2018-04-05", None, "June 1, 2020", "May 5, 2021"],
+        "release_year": ["2019", "2018", "2001", "2020", "x"],
+        "rating": ["PG", "TV-MA", None, "R", "TV-14"],
+        "duration": ["90 min", "2 Seasons", "1000 min", "75 min", "1 Season"],
+        "listed_in": ["Dramas, Comedies", "Kids' TV", None, "Dramas", "Anime Series, Kids' TV"],
+    })
+
+    # no cache, so both runs go through the chunked CSV reader
+    res_one = _run_clean(tmp_path, raw, out="one", use_cache=False)
+    res_chunked = _run_clean(tmp_path, raw, out="chunked", chunksize=2, use_cache=False)
+    assert not (tmp_path / "raw.feather").exists()
+
+    assert res_one["profile"] == res_chunked["profile"]
+    assert res_chunked["profile"]["raw_rows"] == 5
+    for key in ["clean_path", "genres_path"]:
+        # category order follows first appearance, which depends on the chunking
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(res_one[key]), pd.read_parquet(res_chunked[key]), check_categorical=False
+        )
+
+
+def test_clean_netflix_reads_raw_cache(tmp_path, caplog):
+    raw = pd.DataFrame({
+        "show_id": ["s1", "s2", "s3"],
+        "type": ["Movie", "TV Show", "Movie"],
+        "title": ["A", "B", "C"],
+        "listed_in": ["Dramas, Comedies", "Kids' TV", None],
+    })
+
+    res_csv = _run_clean(tmp_path, raw, out="csv")
+    assert (tmp_path / "raw.feather").exists()
+    with caplog.at_level(logging.INFO):
+        res_cached = _run_clean(tmp_path, raw, out="cached", chunksize=2)
+
+    # the first run cached the parsed CSV; the second one was served from it
+    assert "Reading cached raw data" in caplog.text
+    assert res_csv["profile"] == res_cached["profile"]
+    for key in ["clean_path", "genres_path"]:
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(res_csv[key]), pd.read_parquet(res_cached[key]), check_categorical=False
+        )
+
+
+def test_clean_netflix_null_type_profile(tmp_path):
+    raw = pd.DataFrame({
+        "show_id": ["s1", "s2", "s3"],
+        "type": ["Movie", None, "Movie"],
+        "title": ["A", "B", "C"],
+        "duration": ["90 min", "1 Season", "75 min"],
+    })
+
+    res = _run_clean(tmp_path, raw)
+    assert res["profile"]["type_counts"] == {"Movie": 2, "NaN": 1}
+    with open(tmp_path / "out" / "data_profile.json", encoding="utf-8") as f:
+        assert json.load(f)["type_counts"] == {"Movie": 2, "NaN": 1}
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "feather"])
+def test_clean_netflix_first_chunk_all_null_categoricals(tmp_path, fmt):
+    raw = pd.DataFrame({
+        "show_id": ["s1", "s2", "s3", "s4"],
+        "type": [None, None, "Movie", "TV Show"],
+        "title": ["A", "B", "C", "D"],
+        "country": [None, None, "India", "Japan"],
+        "rating": [None, None, "PG", "TV-MA"],
+        "duration": [None, None, "90 min", "2 Seasons"],
+    })
+
+    res = _run_clean(tmp_path, raw, output_format=fmt, chunksize=2)
+    out = READERS[fmt](res["clean_path"])
+    assert out["duration_type"].iloc[2:].tolist() == ["min", "seasons"]
+    assert out["primary_country"].iloc[2:].tolist() == ["India", "Japan"]
+    assert out["duration_type"].iloc[:2].isna().all()
+
+
+def test_csv_writer_timestamp_format(tmp_path):
+    # one fixed format for every chunk, keeping fractional seconds
+    path = tmp_path / "ts.csv"
+    with TableWriter(str(path), "csv") as writer:
+        writer.write(pd.DataFrame({"d": pd.to_datetime(["2020-06-01", None]).as_unit("ms")}))
+        writer.write(pd.DataFrame({"d": pd.to_datetime(["2019-01-01 10:00:00.5"]).as_unit("ms")}))
+    assert path.read_text().splitlines()[1:] == [
+        '"2020-06-01 00:00:00.000"', "", '"2019-01-01 10:00:00.500"'
+    ]
+
+
+def test_clean_netflix_csv_date_added_is_plain_date(tmp_path):
+    raw = pd.DataFrame({
+        "show_id": ["s1", "s2", "s3"],
+        "type": ["Movie"] * 3,
+        "title": ["A", "B", "C"],
+        "date_added": ["June 1, 2020", None, "2019-01-01 10:00:00.5"],
+    })
+
+    res = _run_clean(tmp_path, raw, output_format="csv", chunksize=1)
+    out = pd.read_csv(res["clean_path"], dtype=str)
+    assert out["date_added"].tolist()[0] == "2020-06-01"
+    assert pd.isna(out["date_added"].iloc[1])
+    assert out["date_added"].iloc[2] == "2019-01-01"
+
+
+def test_clean_netflix_unwritable_cache_falls_back(tmp_path, monkeypatch, caplog):
+    raw = pd.DataFrame({"show_id": ["s1", "s2"], "type": ["Movie", "TV Show"], "title": ["A", "B"]})
+
+    def read_only(*args, **kwargs):
+        raise PermissionError("read-only file system")
+
+    monkeypatch.setattr(pa.ipc, "new_file", read_only)
+    with caplog.at_level(logging.WARNING):
+        res = _run_clean(tmp_path, raw, output_format="csv")
+
+    assert "Not caching raw data" in caplog.text
+    assert not (tmp_path / "raw.feather").exists()
+    assert res["profile"]["raw_rows"] == 2
+
+
+def test_clean_netflix_added_quarter(tmp_path):
+    raw = pd.DataFrame({
+        "show_id": ["s1", "s2", "s3", "s4", "s5"],
+        "type": ["Movie"] * 5,
+        "title": ["A", "B", "C", "D", "E"],
+        "date_added": ["March 31, 2020", "April 1, 2020", "December 1, 2019", "January 5, 2021", None],
+    })
+
+    res = _run_clean(tmp_path, raw)
+    quarters = pd.read_parquet(res["clean_path"])["added_quarter"]
+    assert quarters.iloc[:4].tolist() == ["2020Q1", "2020Q2", "2019Q4", "2021Q1"]
+    assert pd.isna(quarters.iloc[4])
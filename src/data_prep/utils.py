@@ -2,13 +2,37 @@
 
 import numpy as np
 import pandas as pd
-from .clean import parse_date_added, parse_duration, explode_genres, normalize_text_field, extract_primary_country
+from .clean import (
+    TableWriter,
+    clean_netflix,
+    parse_date_added,
+    parse_date_added_series,
+    parse_duration,
+    parse_duration_series,
+    explode_genres,
+    explode_genres_table,
+    normalize_text_field,
+    normalize_text_series,
+    extract_primary_country,
+    extract_primary_country_series,
+    make_title_slug,
+    write_table,
+)
 
 # re-export for convenience (tests import from utils)
 __all__ = [
+    "TableWriter",
+    "clean_netflix",
     "parse_date_added",
+    "parse_date_added_series",
     "parse_duration",
+    "parse_duration_series",
     "explode_genres",
+    "explode_genres_table",
     "normalize_text_field",
+    "normalize_text_series",
     "extract_primary_country",
+    "extract_primary_country_series",
+    "make_title_slug",
+    "write_table",
 ]